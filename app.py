@@ -3,16 +3,65 @@ import csv
 import io
 import re
 import os
+import json
+import mimetypes
 from flask import Flask, render_template, request, redirect, url_for, flash, send_from_directory
+from werkzeug.security import safe_join
 import datetime
 from typing import Any
 from dotenv import load_dotenv
 
 load_dotenv()
 # --- App Setup ---
-app = Flask(__name__)
+STATIC_MAX_AGE = 365 * 24 * 60 * 60  # Fingerprinted files never change, so cache them for a year
+PRECOMPRESSED_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+class NajeebFlask(Flask):
+    def send_static_file(self, filename):
+        # Only the fingerprinted files listed in the asset manifest are safe to cache forever
+        if filename not in self.config.get('STATIC_MANIFEST', {}).values():
+            return super().send_static_file(filename)
+
+        # Serve the precompressed variant the client accepts, falling back to the plain file
+        response = None
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            compressed_path = safe_join(self.static_folder, filename + suffix)
+            if request.accept_encodings[encoding] and compressed_path and os.path.isfile(compressed_path):
+                response = send_from_directory(self.static_folder, filename + suffix,
+                                               mimetype=mimetypes.guess_type(filename)[0],
+                                               max_age=STATIC_MAX_AGE)
+                response.headers['Content-Encoding'] = encoding
+                break
+        if response is None:
+            response = send_from_directory(self.static_folder, filename, max_age=STATIC_MAX_AGE)
+
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        response.vary.add('Accept-Encoding')
+        return response
+
+app = NajeebFlask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY') or 'dev-secret-key'
 app.config['PHONE_REGEX'] = re.compile(r'^09\d{8}$') # Syrian phone format
+# Default end-of-year grade progression, can be changed from the bulk operations page (stored in settings)
+app.config['GRADE_PROGRESSION'] = {
+    'الصف الأول': 'الصف الثاني',
+    'الصف الثاني': 'الصف الثالث',
+    'الصف الثالث': 'الصف الرابع',
+    'الصف الرابع': 'الصف الخامس',
+    'الصف الخامس': 'الصف السادس',
+    'الصف السادس': 'الصف السابع',
+    'الصف السابع': 'الصف الثامن',
+    'الصف الثامن': 'الصف التاسع',
+    'الصف التاسع': 'الصف العاشر',
+    'الصف العاشر': 'الصف الحادي عشر',
+    'الصف الحادي عشر': 'الصف الثاني عشر',
+    'الصف الثاني عشر': 'متخرج',
+}
+app.config['SCHOOL_YEAR_START_MONTH'] = 9 # School years run from September to the following summer
+# Allowed student ages, mirrors the CHECK constraint on students.age
+app.config['MIN_STUDENT_AGE'] = 5
+app.config['MAX_STUDENT_AGE'] = 25
 
 # Define the path to the database folder
 env_db_file = os.environ.get('DATABASE_FILE')
@@ -28,6 +77,28 @@ else:
     DATABASE_FOLDER = os.path.join(app.root_path, 'databases')
     DATABASE_FILE = os.path.join(DATABASE_FOLDER, 'students.db')
 
+# --- Static Assets ---
+# Built by build_assets.py: maps logical names ('css/app.css') to fingerprinted files ('dist/app.<hash>.css')
+STATIC_MANIFEST_FILE = os.path.join(app.static_folder, 'dist', 'manifest.json')
+
+def load_static_manifest():
+    try:
+        with open(STATIC_MANIFEST_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+app.config['STATIC_MANIFEST'] = load_static_manifest()
+
+@app.url_defaults
+def fingerprint_static_url(endpoint, values):
+    if endpoint == 'static' and 'filename' in values:
+        values['filename'] = app.config['STATIC_MANIFEST'].get(values['filename'], values['filename'])
+
+@app.context_processor
+def inject_static_manifest():
+    return {'static_assets_built': bool(app.config['STATIC_MANIFEST'])}
+
 # --- Improved Database Functions ---
 def get_db_connection():
     db_dir = os.path.dirname(DATABASE_FILE) or DATABASE_FOLDER
@@ -135,8 +206,9 @@ def validate_student_data(form_data):
 
     try:
         age = int(form_data.get('age', 0))
-        if not (5 <= age <= 25):
-            errors.append("العمر يجب أن يكون بين 5 و 25 سنة")
+        min_age, max_age = app.config['MIN_STUDENT_AGE'], app.config['MAX_STUDENT_AGE']
+        if not (min_age <= age <= max_age):
+            errors.append(f"العمر يجب أن يكون بين {min_age} و {max_age} سنة")
     except ValueError:
         errors.append("العمر يجب أن يكون رقماً صحيحاً")
 
@@ -149,6 +221,9 @@ def validate_student_data(form_data):
 
     return errors
 
+def parse_student_ids(values):
+    return sorted(set(int(sid) for sid in values if sid.isdecimal()))
+
 # --- App Routes ---
 @app.route('/')
 def index():
@@ -435,7 +510,7 @@ def points():
 
             with get_db_connection() as conn:
                 # Ensure IDs are integers and unique
-                int_selected_ids = sorted(list(set([int(sid) for sid in selected_student_ids if sid.isdigit()])))
+                int_selected_ids = parse_student_ids(selected_student_ids)
                 if not int_selected_ids:
                     flash('لم يتم تحديد أي طالب صالح.', 'danger')
                     return redirect(url_for('points'))
@@ -517,6 +592,329 @@ def delete_student(student_id):
 
     return redirect(url_for('index'))
 
+# --- Bulk Operations ---
+BULK_EDITABLE_FIELDS = {
+    'grade': 'الصف',
+    'school_name': 'اسم المدرسة',
+    'address': 'العنوان',
+    'memorizing': 'المحفوظات',
+    'notes': 'الملاحظات',
+}
+
+def get_grade_progression(conn):
+    result = conn.execute("SELECT key_value FROM settings WHERE key_name = 'grade_progression'").fetchone()
+    if result:
+        try:
+            return json.loads(result['key_value'])
+        except ValueError:
+            pass
+    return app.config['GRADE_PROGRESSION']
+
+def save_grade_progression(conn, progression):
+    conn.execute("INSERT OR REPLACE INTO settings (key_name, key_value) VALUES ('grade_progression', ?)",
+                 (json.dumps(progression, ensure_ascii=False),))
+
+def school_year(date):
+    start = date.year if date.month >= app.config['SCHOOL_YEAR_START_MONTH'] else date.year - 1
+    return f'{start}-{start + 1}'
+
+def get_last_promotion(conn):
+    result = conn.execute("SELECT key_value FROM settings WHERE key_name = 'last_promotion'").fetchone()
+    if result:
+        try:
+            return datetime.date.fromisoformat(result['key_value'])
+        except ValueError:
+            pass
+    return None
+
+def save_last_promotion(conn, date):
+    conn.execute("INSERT OR REPLACE INTO settings (key_name, key_value) VALUES ('last_promotion', ?)",
+                 (date.isoformat(),))
+
+def format_grade_progression(progression):
+    return '\n'.join(f'{current} > {new}' for current, new in progression.items())
+
+def parse_grade_progression(text):
+    """Parse 'current grade > next grade' lines into a dict, returning (progression, errors)"""
+    progression = {}
+    errors = []
+    for i, line in enumerate(text.splitlines(), 1):
+        if not line.strip():
+            continue
+        current, separator, new = line.partition('>')
+        current, new = current.strip(), new.strip()
+        if not separator or not current or not new:
+            errors.append(f'السطر {i}: يجب أن يكون بالصيغة "الصف الحالي > الصف الجديد"')
+        elif current in progression:
+            errors.append(f'السطر {i}: الصف "{current}" مكرر')
+        else:
+            progression[current] = new
+
+    if not progression and not errors:
+        errors.append('خريطة ترقية الصفوف فارغة.')
+    return progression, errors
+
+def get_grade_counts(conn):
+    return conn.execute('''
+        SELECT grade, COUNT(*) AS student_count
+        FROM students
+        GROUP BY grade
+        ORDER BY grade ASC
+    ''').fetchall()
+
+def build_student_filter(form_data):
+    """Build the WHERE clause for the students targeted by a bulk form, returning (where, params, errors)"""
+    student_ids = parse_student_ids(form_data.getlist('student_id'))
+    if student_ids:
+        placeholders = ','.join(['?'] * len(student_ids))
+        return f'id IN ({placeholders})', student_ids, []
+
+    conditions = []
+    params = []
+    for field in ('grade', 'school_name'):
+        value = form_data.get(f'filter_{field}', '').strip()
+        if value:
+            conditions.append(f'{field} = ?')
+            params.append(value)
+
+    if not conditions:
+        return None, [], ['الرجاء تحديد الطلاب أو اختيار صف أو مدرسة لتصفية الطلاب.']
+    return ' AND '.join(conditions), params, []
+
+def render_bulk_page(conn, preview=None, selected_ids=(), grade_progression_text=None):
+    grades = get_grade_counts(conn)
+    schools = conn.execute('SELECT DISTINCT school_name FROM students ORDER BY school_name ASC').fetchall()
+
+    selected_students = []
+    if selected_ids:
+        placeholders = ','.join(['?'] * len(selected_ids))
+        selected_students = conn.execute(
+            f'SELECT id, student_name FROM students WHERE id IN ({placeholders}) ORDER BY student_name ASC',
+            list(selected_ids)).fetchall()
+
+    if grade_progression_text is None:
+        grade_progression_text = format_grade_progression(get_grade_progression(conn))
+
+    return render_template('bulk.html',
+                           grades=grades,
+                           schools=[row['school_name'] for row in schools],
+                           selected_students=selected_students,
+                           grade_progression_text=grade_progression_text,
+                           editable_fields=BULK_EDITABLE_FIELDS,
+                           max_age=app.config['MAX_STUDENT_AGE'],
+                           preview=preview)
+
+def make_preview(title, count, details, endpoint, warning=None, override=None):
+    # The confirmation form re-posts the submitted fields together with confirm=1
+    # (and the override checkbox, when the operation needs one to run)
+    excluded = {'confirm', override['name'] if override else None}
+    return {
+        'title': title,
+        'count': count,
+        'details': details,
+        'action_url': url_for(endpoint),
+        'fields': [(key, value) for key, value in request.form.items(multi=True) if key not in excluded],
+        'danger': endpoint == 'bulk_delete',
+        'warning': warning,
+        'override': override,
+    }
+
+class BulkOperationError(Exception):
+    """Raised inside a bulk operation to roll it back and show the message to the user"""
+
+def run_bulk_operation(operation):
+    """Run operation(conn) as a single IMMEDIATE transaction and flash the message it returns, returning success"""
+    conn = None
+    try:
+        conn = get_db_connection()
+        conn.execute('BEGIN IMMEDIATE TRANSACTION')
+        message = operation(conn)
+        conn.commit()
+        flash(message, 'success')
+        return True
+    except BulkOperationError as e:
+        if conn:
+            conn.rollback()
+        flash(str(e), 'danger')
+    except sqlite3.OperationalError as e:
+        if conn:
+            conn.rollback()
+        if 'locked' in str(e):
+            flash('قاعدة البيانات مشغولة حالياً. الرجاء المحاولة مرة أخرى بعد بضع ثوانٍ.', 'danger')
+        else:
+            flash(f'خطأ في قاعدة البيانات: {str(e)}', 'danger')
+    except sqlite3.Error as e:
+        if conn:
+            conn.rollback()
+        flash(f'خطأ في قاعدة البيانات: {str(e)}', 'danger')
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        flash(f'خطأ غير متوقع: {str(e)}', 'danger')
+    finally:
+        if conn:
+            conn.close()
+    return False
+
+@app.route('/bulk', methods=['GET', 'POST'])
+def bulk_actions():
+    # The main page posts its selection here: hundreds of ids do not fit in a query string
+    selected_ids = parse_student_ids(request.form.getlist('student_id'))
+    try:
+        with get_db_connection() as conn:
+            return render_bulk_page(conn, selected_ids=selected_ids)
+    except sqlite3.Error as e:
+        flash(f'خطأ في قاعدة البيانات: {str(e)}', 'danger')
+        return redirect(url_for('index'))
+
+@app.route('/bulk/promote', methods=['POST'])
+def bulk_promote():
+    grade_progression_text = request.form.get('grade_progression', '')
+    progression, errors = parse_grade_progression(grade_progression_text)
+    max_age = app.config['MAX_STUDENT_AGE']
+    today = datetime.date.today()
+    current_school_year = school_year(today)
+    repeat_allowed = request.form.get('repeat_promotion') == '1'
+    memorizing = request.form.get('memorizing', '').strip() or None
+
+    if errors or request.form.get('confirm') != '1':
+        for error in errors:
+            flash(error, 'danger')
+        try:
+            with get_db_connection() as conn:
+                preview = None
+                if not errors:
+                    grades = get_grade_counts(conn)
+                    last_promotion = get_last_promotion(conn)
+                    warning = override = None
+                    if last_promotion is None:
+                        details = ['لم تتم أي ترقية من قبل.']
+                    else:
+                        details = [f'آخر ترقية: {last_promotion.isoformat()} (العام الدراسي {school_year(last_promotion)})']
+                        if school_year(last_promotion) == current_school_year:
+                            warning = (f'تمت ترقية الطلاب بالفعل في العام الدراسي {current_school_year}. '
+                                       'تنفيذ الترقية مرة أخرى سيرفع الصف والعمر سنة إضافية ولا يمكن التراجع عنه.')
+                            override = {'name': 'repeat_promotion',
+                                        'label': 'أؤكد رغبتي في تنفيذ الترقية مرة ثانية في هذا العام الدراسي'}
+                    details.append(f'سيزداد عمر جميع الطلاب سنة واحدة (بحد أقصى {max_age} سنة).')
+                    if memorizing:
+                        details.append(f'المحفوظات لجميع الطلاب ← {memorizing}')
+                    else:
+                        details.append('المحفوظات: تبقى كما هي لكل طالب.')
+                    for row in grades:
+                        if row['grade'] in progression:
+                            details.append(f"{row['grade']} ← {progression[row['grade']]}: {row['student_count']} طالب")
+                        else:
+                            details.append(f"{row['grade']}: {row['student_count']} طالب (لا يوجد صف تالٍ في الخريطة، سيبقى كما هو)")
+                    total = sum(row['student_count'] for row in grades)
+                    preview = make_preview('ترقية الطلاب إلى الصف التالي', total, details, 'bulk_promote',
+                                           warning=warning, override=override)
+                return render_bulk_page(conn, preview=preview, grade_progression_text=grade_progression_text)
+        except sqlite3.Error as e:
+            flash(f'خطأ في قاعدة البيانات: {str(e)}', 'danger')
+            return redirect(url_for('index'))
+
+    def promote(conn):
+        # Checked inside the IMMEDIATE transaction so a re-submitted or concurrent confirmation sees the first run
+        last_promotion = get_last_promotion(conn)
+        if last_promotion and school_year(last_promotion) == current_school_year and not repeat_allowed:
+            raise BulkOperationError(f'تمت ترقية الطلاب بالفعل في العام الدراسي {current_school_year} '
+                                     f'(بتاريخ {last_promotion.isoformat()}). لم يتم تنفيذ أي تغيير.')
+
+        placeholders = ','.join(['?'] * len(progression))
+        promoted = conn.execute(f'SELECT COUNT(*) FROM students WHERE grade IN ({placeholders})',
+                                list(progression)).fetchone()[0]
+
+        # CASE is evaluated against each row's old grade, so chained grades advance exactly one step
+        cases = ' '.join(['WHEN ? THEN ?'] * len(progression))
+        params = [max_age, memorizing] + [value for pair in progression.items() for value in pair]
+        updated = conn.execute(f'''
+            UPDATE students SET
+                age = MIN(age + 1, ?),
+                memorizing = COALESCE(?, memorizing),
+                grade = CASE grade {cases} ELSE grade END
+        ''', params).rowcount
+
+        save_grade_progression(conn, progression)
+        save_last_promotion(conn, today)
+        return f'تمت ترقية {promoted} طالب إلى الصف التالي وزيادة عمر {updated} طالب.'
+
+    if not run_bulk_operation(promote):
+        return redirect(url_for('bulk_actions'))
+    return redirect(url_for('index'))
+
+@app.route('/bulk/edit', methods=['POST'])
+def bulk_edit():
+    updates = {field: request.form.get(field, '').strip() for field in BULK_EDITABLE_FIELDS}
+    updates = {field: value for field, value in updates.items() if value}
+    where, params, errors = build_student_filter(request.form)
+    if not updates:
+        errors.append('الرجاء إدخال قيمة واحدة على الأقل لتعديلها.')
+
+    if errors or request.form.get('confirm') != '1':
+        for error in errors:
+            flash(error, 'danger')
+        # Re-render rather than redirect so the selected ids stay in the form body
+        selected_ids = parse_student_ids(request.form.getlist('student_id'))
+        try:
+            with get_db_connection() as conn:
+                preview = None
+                if not errors:
+                    count = conn.execute(f'SELECT COUNT(*) FROM students WHERE {where}', params).fetchone()[0]
+                    if count == 0:
+                        flash('لم يتم العثور على أي طلاب مطابقين.', 'warning')
+                    else:
+                        details = [f'{BULK_EDITABLE_FIELDS[field]} ← {value}' for field, value in updates.items()]
+                        preview = make_preview('تعديل بيانات مجموعة من الطلاب', count, details, 'bulk_edit')
+                return render_bulk_page(conn, preview=preview, selected_ids=selected_ids)
+        except sqlite3.Error as e:
+            flash(f'خطأ في قاعدة البيانات: {str(e)}', 'danger')
+            return redirect(url_for('index'))
+
+    def edit(conn):
+        assignments = ', '.join(f'{field} = ?' for field in updates)
+        updated = conn.execute(f'UPDATE students SET {assignments} WHERE {where}',
+                               list(updates.values()) + params).rowcount
+        return f'تم تحديث بيانات {updated} طالب بنجاح!'
+
+    run_bulk_operation(edit)
+    return redirect(url_for('index'))
+
+@app.route('/bulk/delete', methods=['POST'])
+def bulk_delete():
+    where, params, errors = build_student_filter(request.form)
+    if errors:
+        for error in errors:
+            flash(error, 'danger')
+        return redirect(url_for('index'))
+
+    if request.form.get('confirm') != '1':
+        try:
+            with get_db_connection() as conn:
+                students = conn.execute(f'SELECT student_name FROM students WHERE {where} ORDER BY student_name ASC',
+                                        params).fetchall()
+                if not students:
+                    flash('لم يتم العثور على أي طلاب مطابقين.', 'warning')
+                    return redirect(url_for('index'))
+                details = [student['student_name'] for student in students[:10]]
+                if len(students) > 10:
+                    details.append(f'...و {len(students) - 10} طلاب آخرين')
+                preview = make_preview('حذف مجموعة من الطلاب (لا يمكن التراجع عن هذا الإجراء)',
+                                       len(students), details, 'bulk_delete')
+                return render_bulk_page(conn, preview=preview)
+        except sqlite3.Error as e:
+            flash(f'خطأ في قاعدة البيانات أثناء الحذف: {str(e)}', 'danger')
+            return redirect(url_for('index'))
+
+    def delete(conn):
+        # Foreign keys are not enforced on these connections, so drop the attendance rows explicitly
+        conn.execute(f'DELETE FROM attendance WHERE student_id IN (SELECT id FROM students WHERE {where})', params)
+        deleted = conn.execute(f'DELETE FROM students WHERE {where}', params).rowcount
+        return f'تم حذف {deleted} طالب بنجاح!'
+
+    run_bulk_operation(delete)
+    return redirect(url_for('index'))
+
 @app.route('/record', methods=['GET', 'POST'])
 def record():
     today = datetime.date.today().isoformat()
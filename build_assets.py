@@ -0,0 +1,215 @@
+"""Build the self-hosted static assets served from ``static/dist``.
+
+Produces a purged/minified Tailwind stylesheet, Cairo font subsets (Arabic and
+Latin only) and a Font Awesome subset holding just the icons the templates use.
+Every output gets a content-hashed file name, text files are precompressed
+(gzip + brotli) and ``static/dist/manifest.json`` maps the logical names used
+in ``url_for('static', ...)`` to the hashed ones.
+
+Usage (from the project root):
+    npm install
+    pip install -r requirements-build.txt
+    python build_assets.py
+"""
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import brotli
+from fontTools import subset
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+NODE_MODULES = os.path.join(ROOT, 'node_modules')
+TEMPLATES_DIR = os.path.join(ROOT, 'templates')
+DIST_DIR = os.path.join(ROOT, 'static', 'dist')
+MANIFEST_FILE = os.path.join(DIST_DIR, 'manifest.json')
+
+TAILWIND_INPUT = os.path.join(ROOT, 'assets', 'css', 'app.css')
+TAILWIND_CONFIG = os.path.join(ROOT, 'tailwind.config.js')
+
+CAIRO_PACKAGE = os.path.join(NODE_MODULES, '@fontsource-variable', 'cairo')
+CAIRO_SUBSETS = ('arabic', 'latin')
+
+FA_PACKAGE = os.path.join(NODE_MODULES, '@fortawesome', 'fontawesome-free')
+FA_FAMILY = 'Font Awesome 6 Free'
+
+HASH_LENGTH = 10
+PRECOMPRESS_EXTENSIONS = ('.css', '.js', '.svg')
+
+
+# --- Output Helpers ---
+def write_hashed(logical_name, content, manifest, build_dir):
+    """Write ``content`` to the build dir under a fingerprinted name and record it in the manifest."""
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    stem, ext = os.path.splitext(os.path.basename(logical_name))
+    hashed_name = f'{stem}.{digest}{ext}'
+
+    with open(os.path.join(build_dir, hashed_name), 'wb') as f:
+        f.write(content)
+
+    if ext in PRECOMPRESS_EXTENSIONS:
+        with open(os.path.join(build_dir, hashed_name + '.gz'), 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=9, mtime=0))
+        with open(os.path.join(build_dir, hashed_name + '.br'), 'wb') as f:
+            f.write(brotli.compress(content, mode=brotli.MODE_TEXT, quality=11))
+
+    manifest[logical_name] = f'dist/{hashed_name}'
+    return hashed_name
+
+
+def require_path(path):
+    if not os.path.exists(path):
+        sys.exit(f"Missing '{os.path.relpath(path, ROOT)}'. Run 'npm install' first.")
+    return path
+
+
+# --- Cairo Font ---
+def build_cairo_fonts(manifest, build_dir):
+    """Copy the Arabic and Latin Cairo variable-font subsets and return their @font-face rules."""
+    with open(require_path(os.path.join(CAIRO_PACKAGE, 'index.css')), encoding='utf-8') as f:
+        package_css = f.read()
+
+    rules = []
+    found = set()
+    for block in re.findall(r'@font-face\s*{([^}]*)}', package_css):
+        src = re.search(r'url\(([^)]+)\)', block)
+        unicode_range = re.search(r'unicode-range:\s*([^;]+);', block)
+        if not src or not unicode_range:
+            continue
+
+        font_path = src.group(1).strip('\'"')
+        subset_name = re.search(r'cairo-([a-z-]+)-wght-normal\.woff2$', font_path)
+        if not subset_name or subset_name.group(1) not in CAIRO_SUBSETS:
+            continue
+
+        with open(require_path(os.path.join(CAIRO_PACKAGE, font_path)), 'rb') as f:
+            hashed_name = write_hashed(f'fonts/cairo-{subset_name.group(1)}.woff2', f.read(), manifest, build_dir)
+        found.add(subset_name.group(1))
+
+        rules.append(
+            "@font-face{font-family:'Cairo';font-style:normal;font-display:swap;"
+            f"font-weight:400 700;src:url({hashed_name}) format('woff2');"
+            f"unicode-range:{unicode_range.group(1).strip()}}}"
+        )
+
+    missing = set(CAIRO_SUBSETS) - found
+    if missing:
+        sys.exit(f"Cairo subsets not found in the font package: {', '.join(sorted(missing))}")
+
+    return ''.join(rules)
+
+
+# --- Font Awesome Icons ---
+def used_icon_names():
+    names = set()
+    for template in os.listdir(TEMPLATES_DIR):
+        if template.endswith('.html'):
+            with open(os.path.join(TEMPLATES_DIR, template), encoding='utf-8') as f:
+                names.update(re.findall(r'\bfa-([a-z0-9-]+)', f.read()))
+    return names
+
+
+def build_icon_font(manifest, build_dir):
+    """Subset the solid Font Awesome font to the icons used by the templates and return its CSS."""
+    with open(require_path(os.path.join(FA_PACKAGE, 'metadata', 'icons.json')), encoding='utf-8') as f:
+        icons = json.load(f)
+
+    codepoints = {}
+    for name, icon in icons.items():
+        if 'solid' not in icon.get('free', []):
+            continue
+        for alias in [name] + icon.get('aliases', {}).get('names', []):
+            codepoints[alias] = icon['unicode']
+
+    # Utility classes such as 'fa-spin' are not glyphs and have no codepoint.
+    used = {name: codepoints[name] for name in sorted(used_icon_names()) if name in codepoints}
+
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = ['*']
+    font = subset.load_font(require_path(os.path.join(FA_PACKAGE, 'webfonts', 'fa-solid-900.ttf')), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=[int(code, 16) for code in used.values()])
+    subsetter.subset(font)
+
+    buffer = io.BytesIO()
+    subset.save_font(font, buffer, options)
+    hashed_name = write_hashed('fonts/fa-solid.woff2', buffer.getvalue(), manifest, build_dir)
+
+    glyph_rules = ''.join(f'.fa-{name}:before{{content:"\\{code}"}}' for name, code in used.items())
+    return (
+        f'@font-face{{font-family:"{FA_FAMILY}";font-style:normal;font-weight:900;font-display:block;'
+        f'src:url({hashed_name}) format("woff2")}}'
+        f'.fas{{font-family:"{FA_FAMILY}";font-weight:900;font-style:normal;font-variant:normal;'
+        'display:inline-block;line-height:1;text-rendering:auto;-webkit-font-smoothing:antialiased}'
+        '.fa-spin{animation:fa-spin 2s linear infinite}'
+        '@keyframes fa-spin{0%{transform:rotate(0)}to{transform:rotate(1turn)}}'
+        f'{glyph_rules}'
+    )
+
+
+# --- Tailwind ---
+def build_tailwind():
+    """Run the Tailwind CLI in purge + minify mode and return the generated CSS."""
+    npx = shutil.which('npx')
+    if npx is None:
+        sys.exit("'npx' was not found. Install Node.js to build the stylesheet.")
+    require_path(os.path.join(NODE_MODULES, 'tailwindcss'))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'app.css')
+        subprocess.run(
+            [npx, '--no-install', 'tailwindcss',
+             '-c', TAILWIND_CONFIG, '-i', TAILWIND_INPUT, '-o', output, '--minify'],
+            cwd=ROOT, check=True,
+        )
+        with open(output, encoding='utf-8') as f:
+            return f.read()
+
+
+def publish(build_dir, manifest):
+    """Move a finished build into dist, replacing the manifest last.
+
+    Hashed files from earlier builds are kept: running app workers load the
+    manifest once at startup and keep linking to them until they restart.
+    """
+    os.makedirs(DIST_DIR, exist_ok=True)
+    for name in os.listdir(build_dir):
+        os.replace(os.path.join(build_dir, name), os.path.join(DIST_DIR, name))
+
+    manifest_tmp = os.path.join(build_dir, 'manifest.json')
+    with open(manifest_tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(manifest_tmp, MANIFEST_FILE)
+
+
+def main():
+    # Build next to dist (same filesystem, so the final moves are atomic) and only
+    # publish once every step succeeded, leaving a working dist untouched on failure.
+    build_dir = tempfile.mkdtemp(prefix='.dist-build-', dir=os.path.dirname(DIST_DIR))
+    try:
+        manifest = {}
+        font_css = build_cairo_fonts(manifest, build_dir)
+        icon_css = build_icon_font(manifest, build_dir)
+        tailwind_css = build_tailwind()
+
+        # Fonts are referenced relative to the stylesheet, which lives next to them in dist/.
+        write_hashed('css/app.css', (font_css + icon_css + tailwind_css).encode('utf-8'), manifest, build_dir)
+        publish(build_dir, manifest)
+    finally:
+        shutil.rmtree(build_dir, ignore_errors=True)
+
+    for logical_name, hashed_name in sorted(manifest.items()):
+        size = os.path.getsize(os.path.join(DIST_DIR, os.path.basename(hashed_name)))
+        print(f'{logical_name} -> {hashed_name} ({size / 1024:.1f} KiB)')
+    print(f'Static assets built in {os.path.relpath(DIST_DIR, ROOT)}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+/** @type {import('tailwindcss').Config} */
+module.exports = {
+  // Every class used by the app (including the ones toggled from inline
+  // scripts) lives in the Jinja templates, so they are the only content source.
+  content: ['./templates/**/*.html'],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+}